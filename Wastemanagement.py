@@ -2,24 +2,31 @@
 # Waste Management Digital IT Dashboard (Single-File Streamlit App)
 # -----------------------------------------------------------------
 # How to run:
-#   pip install streamlit pandas altair plotly numpy
+#   pip install streamlit pandas plotly numpy pyarrow
 #   streamlit run app.py
 
 import streamlit as st
 import pandas as pd
 import numpy as np
-import altair as alt
+import pyarrow as pa
 import datetime
 
 # Configure Streamlit (do this once, near the top)
 st.set_page_config(page_title='Waste Management Tool', layout='wide')
 
-# Try to import Plotly. If missing, degrade gracefully.
-PLOTLY_AVAILABLE = True
-try:
-    import plotly.graph_objects as go
-except Exception:
-    PLOTLY_AVAILABLE = False
+# Plotly is imported on first use (only the Plotly views pay for it). If missing, degrade gracefully.
+go = None
+PLOTLY_AVAILABLE = None
+
+def _get_go():
+    global go, PLOTLY_AVAILABLE
+    if PLOTLY_AVAILABLE is None:
+        try:
+            import plotly.graph_objects as go_mod
+            go, PLOTLY_AVAILABLE = go_mod, True
+        except Exception:
+            PLOTLY_AVAILABLE = False
+    return go
 
 # -----------------------------
 # Synthetic Demo Data
@@ -54,6 +61,12 @@ impact_by_sku = [
      "collectionTarget": 45, "currentCollection": 35},
 ]
 
+waste_flow = [
+    {'label': 'Plastic', 'collected': 1200, 'recycled': 300, 'landfill': 120},
+    {'label': 'E‑Waste', 'collected': 180, 'recycled': 120, 'landfill': 15},
+    {'label': 'Battery', 'collected': 220, 'recycled': 160, 'landfill': 10},
+]
+
 epr_waterfall_plastic = [
     {"stage": "Obligation FY25", "amount": 1800},
     {"stage": "Collections", "amount": -1200},
@@ -106,40 +119,76 @@ alerts_list = [
 ]
 
 # -----------------------------
-# Helpers
+# Cached constructors
 # -----------------------------
-def days_to_deadline(deadline_str: str) -> int:
-    deadline = datetime.datetime.strptime(deadline_str, '%Y-%m-%d').date()
-    today = datetime.date.today()
-    return max(0, (deadline - today).days)
+@st.cache_data(persist="disk", ttl=None)
+def _df(rows, categories=()):
+    """Build a DataFrame once and persist it to disk, so server restarts start warm.
+
+    Rows are transposed to columns (union of keys, missing cells -> null) and
+    built as an Arrow table, so the frame is Arrow-backed end to end. Columns
+    named in ``categories`` are cast to category (dictionary-encoded on the wire).
+    """
+    keys = dict.fromkeys(k for row in rows for k in row)
+    table = pa.table({k: [row.get(k) for row in rows] for k in keys})
+    df = table.to_pandas(types_mapper=pd.ArrowDtype)
+    for col in categories:
+        df[col] = df[col].astype('category')
+    return df
 
-timeline_rules = [{"rule": r["id"], "daysToDeadline": days_to_deadline(r["deadline"])}
-                  for r in regulatory_feed]
+# -----------------------------
+# Helpers
+# -----------------------------
+@st.cache_data(max_entries=1)
+def get_regulatory_df(today: datetime.date):
+    """Regulatory feed plus days-to-deadline; keyed on ``today`` (not persisted) so it rolls over at midnight."""
+    df = _df(regulatory_feed)
+    deadlines = pd.to_datetime(df['deadline'], format='%Y-%m-%d')
+    df['daysToDeadline'] = (deadlines - pd.Timestamp(today)).dt.days.clip(lower=0)
+    return df
 
 def simulate(material_from, material_to, recycled_pct, lead_time_days, traceability, base_cost_per_unit=10):
-    """Eco‑Design What‑If: compliance, cost delta, availability risk, EPR gap reduction."""
+    """Eco‑Design What‑If: compliance, cost delta, availability risk, EPR gap reduction.
+
+    Inputs may be scalars or equal-shaped arrays (for scenario sweeps); scalar
+    inputs return plain Python numbers.
+    """
+    material_from, material_to = np.asarray(material_from), np.asarray(material_to)
+    recycled_pct, lead_time_days = np.asarray(recycled_pct), np.asarray(lead_time_days)
+    traceability = np.asarray(traceability, dtype=bool)
+
     compliance_target = 20
-    material_boost = 12 if (material_from == 'PVC' and material_to == 'PET') else 4
-    compliance_score = min(100, 60 + material_boost + max(0, recycled_pct - compliance_target))
+    material_boost = np.where((material_from == 'PVC') & (material_to == 'PET'), 12, 4)
+    compliance_score = np.minimum(100, 60 + material_boost + np.maximum(0, recycled_pct - compliance_target))
 
-    material_cost_factor = 1.08 if material_to == 'PET' else 1.0
-    traceability_cost = 0.02 if traceability else 0
+    material_cost_factor = np.where(material_to == 'PET', 1.08, 1.0)
+    traceability_cost = np.where(traceability, 0.02, 0.0)
     new_cost = base_cost_per_unit * material_cost_factor * (1 + traceability_cost)
-    cost_delta_pct = round(((new_cost - base_cost_per_unit) / base_cost_per_unit) * 100)
+    cost_delta_pct = np.round(((new_cost - base_cost_per_unit) / base_cost_per_unit) * 100).astype(int)
 
     base_risk = 20
-    lead_risk = max(0, (lead_time_days - 10) * 2)
-    recycled_risk = max(0, (recycled_pct - compliance_target) * 0.8)
-    availability_risk = min(95, base_risk + lead_risk + recycled_risk)
+    lead_risk = np.maximum(0, (lead_time_days - 10) * 2)
+    recycled_risk = np.maximum(0, (recycled_pct - compliance_target) * 0.8)
+    availability_risk = np.minimum(95, base_risk + lead_risk + recycled_risk)
 
-    epr_gap_reduction = round((recycled_pct - compliance_target) * 5)
+    epr_gap_reduction = np.round((recycled_pct - compliance_target) * 5).astype(int)
 
-    return {
+    result = {
         'complianceScore': compliance_score,
         'costDeltaPct': cost_delta_pct,
         'availabilityRisk': availability_risk,
         'eprGapReduction': epr_gap_reduction
     }
+    if all(np.ndim(v) == 0 for v in result.values()):
+        result = {k: v.item() for k, v in result.items()}
+        # Match the builtin max/min types: a score stays int unless a float term enters uncapped.
+        recycled_int = np.issubdtype(recycled_pct.dtype, np.integer) or recycled_pct <= compliance_target
+        lead_int = np.issubdtype(lead_time_days.dtype, np.integer) or lead_time_days <= 10
+        if recycled_int or result['complianceScore'] >= 100:
+            result['complianceScore'] = int(result['complianceScore'])
+        if (lead_int and recycled_pct <= compliance_target) or result['availabilityRisk'] >= 95:
+            result['availabilityRisk'] = int(result['availabilityRisk'])
+    return result
 
 def mcda_score(metrics: dict, weights: dict) -> int:
     """MCDA scoring; cost is lower-better (invert)."""
@@ -152,10 +201,139 @@ def mcda_score(metrics: dict, weights: dict) -> int:
     }
     return round(sum(normalized[k] * weights[k] for k in weights))
 
+# -----------------------------
+# Chart specs (raw Vega-Lite, no Altair spec build per rerun)
+# -----------------------------
+# Stacked/line charts take the wide tables and fold them to long form in the browser.
+FLOW_SPEC = {
+    "transform": [{"fold": ["collected", "recycled", "landfill"], "as": ["stage", "tons"]}],
+    "mark": "bar",
+    "encoding": {
+        "x": {"field": "label", "type": "nominal", "title": "Category"},
+        "y": {"field": "tons", "type": "quantitative", "stack": "normalize", "title": "Share"},
+        "color": {"field": "stage", "type": "nominal",
+                  "scale": {"range": ["#38bdf8", "#22c55e", "#ef4444"]}},
+    },
+    "height": 300,
+}
+
+INVENTORY_SPEC = {
+    "mark": {"type": "circle", "size": 90},
+    "encoding": {
+        "x": {"field": "leadTime", "type": "quantitative", "title": "Lead Time (days)"},
+        "y": {"field": "daysOfCover", "type": "quantitative", "title": "Days of Cover"},
+        "color": {"field": "class", "type": "nominal",
+                  "scale": {"domain": ["A", "B", "C"], "range": ["#38bdf8", "#22c55e", "#f59e0b"]}},
+        "tooltip": [{"field": "sku", "type": "nominal"},
+                    {"field": "leadTime", "type": "quantitative"},
+                    {"field": "daysOfCover", "type": "quantitative"},
+                    {"field": "class", "type": "nominal"}],
+    },
+    "height": 300,
+}
+
+ALERT_BACKLOG_SPEC = {
+    "transform": [{"fold": ["critical", "high", "medium"], "as": ["severity", "count"]}],
+    "mark": "bar",
+    "encoding": {
+        "x": {"field": "site", "type": "nominal"},
+        "y": {"field": "count", "type": "quantitative"},
+        "color": {"field": "severity", "type": "nominal",
+                  "scale": {"domain": ["critical", "high", "medium"],
+                            "range": ["#ef4444", "#f59e0b", "#38bdf8"]}},
+    },
+    "height": 300,
+}
+
+EPR_TREND_SPEC = {
+    "transform": [{"fold": ["plastic", "ewaste", "battery"], "as": ["category", "fulfilment"]}],
+    "mark": {"type": "line", "point": True},
+    "encoding": {
+        "x": {"field": "month", "type": "nominal"},
+        "y": {"field": "fulfilment", "type": "quantitative", "title": "%"},
+        "color": {"field": "category", "type": "nominal",
+                  "scale": {"domain": ["plastic", "ewaste", "battery"],
+                            "range": ["#38bdf8", "#f59e0b", "#22c55e"]}},
+    },
+    "height": 300,
+}
+
+DEADLINE_SPEC = {
+    "mark": {"type": "bar", "color": "#ef4444"},
+    "encoding": {
+        "x": {"field": "id", "type": "nominal", "title": "Rule"},
+        "y": {"field": "daysToDeadline", "type": "quantitative", "title": "Days"},
+    },
+    "height": 300,
+}
+
+def _alert_chart():
+    """Alert backlog by site; shared by the landing and alerts views."""
+    st.vega_lite_chart(_df(threshold_breaches_by_site, categories=('site',)), ALERT_BACKLOG_SPEC,
+                       use_container_width=True)
+
+def _inv_scatter(height=300):
+    """Days of cover vs lead time; shared by the landing and inventory views."""
+    spec = INVENTORY_SPEC if height == INVENTORY_SPEC['height'] else {**INVENTORY_SPEC, 'height': height}
+    st.vega_lite_chart(_df(inventory_scatter, categories=('class',)), spec, use_container_width=True)
+
+# -----------------------------
+# Plotly figures (built once per process)
+# -----------------------------
+# Shared dark layout, passed at construction instead of a separate update_layout pass.
+DARK = dict(template='plotly_dark', margin=dict(l=10, r=10, t=30, b=10))
+
+@st.cache_resource
+def _sankey():
+    go = _get_go()
+    nodes = ["Plastic", "E‑Waste", "Battery", "Recycle", "Reuse", "Co‑process", "Landfill"]
+    node_colors = ["#38bdf8", "#f59e0b", "#22c55e", "#22c55e", "#60a5fa", "#a78bfa", "#ef4444"]
+    source = np.array([0, 0, 0, 0, 1, 1, 1, 2, 2, 2], dtype=np.int32)
+    target = np.array([3, 4, 5, 6, 3, 4, 6, 3, 4, 6], dtype=np.int32)
+    value = np.array([300, 280, 500, 120, 120, 45, 15, 160, 50, 10], dtype=np.int32)
+
+    sankey_fig = go.Figure(data=go.Sankey(
+        arrangement="snap",
+        node=dict(pad=18, thickness=24, line=dict(color="rgba(255,255,255,0.3)", width=1),
+                  label=nodes, color=node_colors),
+        link=dict(source=source, target=target, value=value,
+                  color=["#22c55e", "#60a5fa", "#a78bfa", "#ef4444",
+                         "#22c55e", "#60a5fa", "#ef4444",
+                         "#22c55e", "#60a5fa", "#ef4444"])
+    ), layout=go.Layout(**DARK, height=420))
+    return sankey_fig
+
+RADAR_METRICS = ['Compliance', 'Cost (inverse)', 'Availability', 'Recyclability', 'Traceability']
+
+def _radar_fig(a, b, height):
+    go = _get_go()
+    return go.Figure(
+        data=[go.Scatterpolar(r=a, theta=RADAR_METRICS,
+                              fill='toself', name='Option A', line=dict(color='#38bdf8')),
+              go.Scatterpolar(r=b, theta=RADAR_METRICS,
+                              fill='toself', name='Option B', line=dict(color='#22c55e'))],
+        layout=go.Layout(**DARK, height=height, showlegend=True,
+                         polar=dict(radialaxis=dict(visible=True, range=[0, 100]))))
+
+@st.cache_resource
+def _landing_radar():
+    return _radar_fig([72, 60, 70, 55, 50], [88, 68, 62, 82, 80], height=300)
+
+def _ecodesign_radar():
+    """Radar built once per session; reruns only swap the r arrays.
+
+    Kept in session_state rather than st.cache_resource because callers mutate
+    it, and a cached figure would be shared (and raced on) across sessions.
+    """
+    if '_ecodesign_radar' not in st.session_state:
+        st.session_state['_ecodesign_radar'] = _radar_fig([0] * 5, [0] * 5, height=320)
+    return st.session_state['_ecodesign_radar']
+
 # -----------------------------
 # Render Functions (Tabs)
 # -----------------------------
 def render_landing():
+    go = _get_go()
     st.markdown("## Global Landing")
 
     col1, col2, col3, col4 = st.columns(4)
@@ -173,44 +351,17 @@ def render_landing():
     st.divider()
 
     st.subheader('Regulatory Change Feed (India EPR)')
-    st.dataframe(pd.DataFrame(regulatory_feed), use_container_width=True)
+    st.dataframe(_df(regulatory_feed), use_container_width=True)
 
     st.subheader('Waste Flow (approx) – Collection → Processing (Stacked bars)')
-    flow_df = pd.DataFrame([
-        {'label': 'Plastic', 'collected': 1200, 'recycled': 300, 'landfill': 120},
-        {'label': 'E‑Waste', 'collected': 180, 'recycled': 120, 'landfill': 15},
-        {'label': 'Battery', 'collected': 220, 'recycled': 160, 'landfill': 10},
-    ])
-    flow_m = flow_df.melt('label', var_name='stage', value_name='tons')
-    chart = alt.Chart(flow_m).mark_bar().encode(
-        x=alt.X('label:N', title='Category'),
-        y=alt.Y('tons:Q', stack='normalize', title='Share'),
-        color=alt.Color('stage:N', scale=alt.Scale(range=['#38bdf8', '#22c55e', '#ef4444']))
-    ).properties(height=300)
-    st.altair_chart(chart, use_container_width=True)
+    st.vega_lite_chart(_df(waste_flow, categories=('label',)), FLOW_SPEC, use_container_width=True)
 
     # Sankey
     st.subheader('Waste Flow Sankey – Generation → Processing Outcomes')
     if not PLOTLY_AVAILABLE:
         st.warning("Plotly is not installed, so the Sankey cannot be rendered. Install Plotly: `pip install plotly`.")
     else:
-        nodes = ["Plastic", "E‑Waste", "Battery", "Recycle", "Reuse", "Co‑process", "Landfill"]
-        node_colors = ["#38bdf8", "#f59e0b", "#22c55e", "#22c55e", "#60a5fa", "#a78bfa", "#ef4444"]
-        source = [0, 0, 0, 0, 1, 1, 1, 2, 2, 2]
-        target = [3, 4, 5, 6, 3, 4, 6, 3, 4, 6]
-        value =  [300, 280, 500, 120, 120, 45, 15, 160, 50, 10]
-
-        sankey_fig = go.Figure(go.Sankey(
-            arrangement="snap",
-            node=dict(pad=18, thickness=24, line=dict(color="rgba(255,255,255,0.3)", width=1),
-                      label=nodes, color=node_colors),
-            link=dict(source=source, target=target, value=value,
-                      color=["#22c55e", "#60a5fa", "#a78bfa", "#ef4444",
-                             "#22c55e", "#60a5fa", "#ef4444",
-                             "#22c55e", "#60a5fa", "#ef4444"])
-        ))
-        sankey_fig.update_layout(template="plotly_dark", height=420, margin=dict(l=10, r=10, t=30, b=10))
-        st.plotly_chart(sankey_fig, use_container_width=True)
+        st.plotly_chart(_sankey(), use_container_width=True)
 
     colA, colB, colC = st.columns(3)
     with colA:
@@ -218,84 +369,50 @@ def render_landing():
         if not PLOTLY_AVAILABLE:
             st.info("Plotly not installed. Install Plotly to see the waterfall chart (`pip install plotly`).")
         else:
-            wf = pd.DataFrame(epr_waterfall_plastic)
-            fig = go.Figure(go.Waterfall(
+            wf = _df(epr_waterfall_plastic)
+            fig = go.Figure(data=go.Waterfall(
                 orientation='v',
                 measure=['absolute', 'relative', 'relative', 'total'],
                 x=wf['stage'], y=wf['amount'],
                 connector={'line': {'color': 'rgba(255,255,255,0.4)'}}
-            ))
-            fig.update_layout(height=300, margin=dict(l=10, r=10, t=30, b=10), template='plotly_dark')
+            ), layout=go.Layout(**DARK, height=300))
             st.plotly_chart(fig, use_container_width=True)
 
     with colB:
         st.subheader('Inventory Health – Days of Cover vs Lead Time')
-        inv = pd.DataFrame(inventory_scatter)
-        chart2 = alt.Chart(inv).mark_circle(size=90).encode(
-            x=alt.X('leadTime:Q', title='Lead Time (days)'),
-            y=alt.Y('daysOfCover:Q', title='Days of Cover'),
-            color=alt.Color('class:N', scale=alt.Scale(domain=['A', 'B', 'C'],
-                                                       range=['#38bdf8', '#22c55e', '#f59e0b'])),
-            tooltip=['sku', 'leadTime', 'daysOfCover', 'class']
-        ).properties(height=300)
-        st.altair_chart(chart2, use_container_width=True)
+        _inv_scatter()
 
     with colC:
         st.subheader('Eco‑Design Spotlight (MCDA Radar)')
         if not PLOTLY_AVAILABLE:
             st.info("Plotly not installed. Install Plotly to see the radar chart (`pip install plotly`).")
         else:
-            radar_df = pd.DataFrame([
-                {'metric': 'Compliance', 'A': 72, 'B': 88},
-                {'metric': 'Cost (inverse)', 'A': 60, 'B': 68},
-                {'metric': 'Availability', 'A': 70, 'B': 62},
-                {'metric': 'Recyclability', 'A': 55, 'B': 82},
-                {'metric': 'Traceability', 'A': 50, 'B': 80},
-            ])
-            fig2 = go.Figure()
-            fig2.add_trace(go.Scatterpolar(r=radar_df['A'], theta=radar_df['metric'],
-                                           fill='toself', name='Option A', line=dict(color='#38bdf8')))
-            fig2.add_trace(go.Scatterpolar(r=radar_df['B'], theta=radar_df['metric'],
-                                           fill='toself', name='Option B', line=dict(color='#22c55e')))
-            fig2.update_layout(polar=dict(radialaxis=dict(visible=True, range=[0, 100])),
-                               showlegend=True, height=300, template='plotly_dark')
-            st.plotly_chart(fig2, use_container_width=True)
+            st.plotly_chart(_landing_radar(), use_container_width=True)
 
     st.subheader('Alert Backlog by Site')
-    ab = pd.DataFrame(threshold_breaches_by_site)
-    ab_m = ab.melt('site', var_name='severity', value_name='count')
-    chart3 = alt.Chart(ab_m).mark_bar().encode(
-        x=alt.X('site:N'), y='count:Q',
-        color=alt.Color('severity:N', scale=alt.Scale(domain=['critical', 'high', 'medium'],
-                                                      range=['#ef4444', '#f59e0b', '#38bdf8']))
-    ).properties(height=300)
-    st.altair_chart(chart3, use_container_width=True)
+    _alert_chart()
 
 def render_compliance():
     st.markdown('## Mandatory Compliance – Regulatory Intelligence & Alerting')
 
     st.subheader('Regulatory Feed & Watchlist')
-    st.dataframe(pd.DataFrame(regulatory_feed), use_container_width=True)
+    reg = get_regulatory_df(datetime.date.today())
+    st.dataframe(reg, use_container_width=True)
 
     st.subheader('Impact Assessment by SKU & Packaging')
-    st.dataframe(pd.DataFrame(impact_by_sku), use_container_width=True)
+    st.dataframe(_df(impact_by_sku), use_container_width=True)
 
     st.subheader('Compliance Readiness & Deadlines (days to deadline)')
-    tr = pd.DataFrame(timeline_rules)
-    chart = alt.Chart(tr).mark_bar(color='#ef4444').encode(
-        x=alt.X('rule:N', title='Rule'),
-        y=alt.Y('daysToDeadline:Q', title='Days')
-    ).properties(height=300)
-    st.altair_chart(chart, use_container_width=True)
+    st.vega_lite_chart(reg[['id', 'daysToDeadline']], DEADLINE_SPEC, use_container_width=True)
 
     st.subheader('Reporting & Filings – CPCB Submission Calendar')
-    cal = pd.DataFrame([
+    cal = _df([
         {'month': 'Nov', 'Plastic': 'Submitted', 'E‑Waste': 'Planned', 'Battery': 'Planned', 'Status': 'Submitted'},
         {'month': 'Dec', 'Plastic': 'Draft', 'E‑Waste': 'Planned', 'Battery': 'Planned', 'Status': 'Pending'},
         {'month': 'Jan', 'Plastic': 'Planned', 'E‑Waste': 'Draft', 'Battery': 'Planned', 'Status': 'Pending'},
         {'month': 'Feb', 'Plastic': 'Planned', 'E‑Waste': 'Planned', 'Battery': 'Draft', 'Status': 'Pending'},
     ])
-    st.dataframe(cal, use_container_width=True)
+    st.table(cal)
 
 def render_alerts():
     st.markdown('## Alerts & Thresholds')
@@ -311,86 +428,76 @@ def render_alerts():
     st.caption('Changing thresholds affects alert volume; wire to policy store in production.')
 
     st.subheader('Active Alerts by Site & Severity')
-    ab = pd.DataFrame(threshold_breaches_by_site)
-    ab_m = ab.melt('site', var_name='severity', value_name='count')
-    chart = alt.Chart(ab_m).mark_bar().encode(
-        x='site:N', y='count:Q',
-        color=alt.Color('severity:N', scale=alt.Scale(domain=['critical', 'high', 'medium'],
-                                                      range=['#ef4444', '#f59e0b', '#38bdf8']))
-    ).properties(height=300)
-    st.altair_chart(chart, use_container_width=True)
+    _alert_chart()
 
     st.subheader('Alert Backlog & SLA')
-    st.dataframe(pd.DataFrame(alerts_list), use_container_width=True)
+    st.dataframe(_df(alerts_list), use_container_width=True)
 
 def render_inventory():
     st.markdown('## Inventory Management')
 
     st.subheader('Raw Materials & Packaging – ABC / Days of Cover vs Lead Time')
-    inv = pd.DataFrame(inventory_scatter)
-    chart = alt.Chart(inv).mark_circle(size=90).encode(
-        x=alt.X('leadTime:Q', title='Lead Time (days)'),
-        y=alt.Y('daysOfCover:Q', title='Days of Cover'),
-        color=alt.Color('class:N', scale=alt.Scale(domain=['A', 'B', 'C'],
-                                                   range=['#38bdf8', '#22c55e', '#f59e0b'])),
-        tooltip=['sku', 'leadTime', 'daysOfCover', 'class']
-    ).properties(height=320)
-    st.altair_chart(chart, use_container_width=True)
+    _inv_scatter(height=320)
 
     st.subheader('Waste Inventory & Segregation')
-    waste = pd.DataFrame([
+    waste = _df([
         {'Category': 'Plastic', 'Qty (t)': 1200, 'Recycled (t)': 300, 'Landfill (t)': 120, 'Aging (days)': 12},
         {'Category': 'E‑Waste', 'Qty (t)': 180, 'Recycled (t)': 120, 'Landfill (t)': 15, 'Aging (days)': 9},
         {'Category': 'Battery', 'Qty (t)': 220, 'Recycled (t)': 160, 'Landfill (t)': 10, 'Aging (days)': 7},
     ])
-    st.dataframe(waste, use_container_width=True)
+    st.table(waste)
 
     st.subheader('BOM Compliance & Non‑Compliant Stock')
-    bom = pd.DataFrame([
+    bom = _df([
         {'SKU': 'FOOD-P-007', 'Old BOM': 'PVC label', 'Compliant BOM': 'PET label',
          'Non‑Compliant Stock (₹L)': 28, 'Plan': 'Phase‑out by Jan'},
         {'SKU': 'BATT-L-003', 'Old BOM': 'Old separator', 'Compliant BOM': 'Compliant separator',
          'Non‑Compliant Stock (₹L)': 12, 'Plan': 'Rework by Dec'},
     ])
-    st.dataframe(bom, use_container_width=True)
+    st.table(bom)
 
 def render_epr():
+    go = _get_go()
     st.markdown('## EPR Tracking')
 
     st.subheader('EPR Fulfilment Trend by Category')
-    trend = pd.DataFrame(epr_trend)
-    trend_m = trend.melt('month', var_name='category', value_name='fulfilment')
-    chart = alt.Chart(trend_m).mark_line(point=True).encode(
-        x='month:N',
-        y=alt.Y('fulfilment:Q', title='%'),
-        color=alt.Color('category:N', scale=alt.Scale(domain=['plastic', 'ewaste', 'battery'],
-                                                      range=['#38bdf8', '#f59e0b', '#22c55e']))
-    ).properties(height=300)
-    st.altair_chart(chart, use_container_width=True)
+    st.vega_lite_chart(_df(epr_trend, categories=('month',)), EPR_TREND_SPEC, use_container_width=True)
 
     st.subheader('Gap Analysis – Plastic (Waterfall)')
     if not PLOTLY_AVAILABLE:
         st.info("Plotly not installed. Install Plotly to see the waterfall chart (`pip install plotly`).")
     else:
-        wf = pd.DataFrame(epr_waterfall_plastic)
-        fig = go.Figure(go.Waterfall(orientation='v',
-                                     measure=['absolute', 'relative', 'relative', 'total'],
-                                     x=wf['stage'], y=wf['amount']))
-        fig.update_layout(height=300, template='plotly_dark')
+        wf = _df(epr_waterfall_plastic)
+        fig = go.Figure(data=go.Waterfall(orientation='v',
+                                          measure=['absolute', 'relative', 'relative', 'total'],
+                                          x=wf['stage'], y=wf['amount']),
+                        layout=go.Layout(**DARK, height=300))
         st.plotly_chart(fig, use_container_width=True)
 
     st.subheader('CPCB Reporting Status')
-    cal = pd.DataFrame([
+    cal = _df([
         {'Month': 'Nov', 'Status': 'Submitted', 'Error Log': ''},
         {'Month': 'Dec', 'Status': 'In Progress', 'Error Log': 'Missing UID in 3 SKUs'},
         {'Month': 'Jan', 'Status': 'In Progress', 'Error Log': ''},
         {'Month': 'Feb', 'Status': 'In Progress', 'Error Log': ''},
     ])
-    st.dataframe(cal, use_container_width=True)
+    st.table(cal)
 
 def render_ecodesign():
     st.markdown('## Eco‑Design & Substance Registry')
 
+    _ecodesign_whatif()
+
+    st.subheader('Material Library & Substance Registry (Demo)')
+    st.table(_df(material_library))
+
+    st.subheader('Digital Traceability Readiness')
+    st.table(_df(traceability_readiness))
+
+@st.fragment
+def _ecodesign_whatif():
+    """What-If inputs, metrics, MCDA and radar; input changes rerun only this fragment."""
+    _get_go()
     st.subheader('What‑If Simulator')
     col1, col2, col3, col4, col5 = st.columns(5)
     with col1:
@@ -431,82 +538,79 @@ def render_ecodesign():
     if not PLOTLY_AVAILABLE:
         st.info("Plotly not installed. Install Plotly to see the radar chart (`pip install plotly`).")
     else:
-        radar_df = pd.DataFrame([
-            {'metric': 'Compliance', 'A': optionA['compliance'], 'B': optionB['compliance']},
-            {'metric': 'Cost (inverse)', 'A': 100 - optionA['cost'], 'B': 100 - optionB['cost']},
-            {'metric': 'Availability', 'A': optionA['availability'], 'B': optionB['availability']},
-            {'metric': 'Recyclability', 'A': optionA['recyclability'], 'B': optionB['recyclability']},
-            {'metric': 'Traceability', 'A': optionA['traceability'], 'B': optionB['traceability']},
-        ])
-        fig = go.Figure()
-        fig.add_trace(go.Scatterpolar(r=radar_df['A'], theta=radar_df['metric'],
-                                      fill='toself', name='Option A', line=dict(color='#38bdf8')))
-        fig.add_trace(go.Scatterpolar(r=radar_df['B'], theta=radar_df['metric'],
-                                      fill='toself', name='Option B', line=dict(color='#22c55e')))
-        fig.update_layout(polar=dict(radialaxis=dict(visible=True, range=[0, 100])),
-                          showlegend=True, height=320, template='plotly_dark')
+        fig = _ecodesign_radar()
+        fig.data[0].r = [optionA['compliance'], 100 - optionA['cost'], optionA['availability'],
+                         optionA['recyclability'], optionA['traceability']]
+        fig.data[1].r = [optionB['compliance'], 100 - optionB['cost'], optionB['availability'],
+                         optionB['recyclability'], optionB['traceability']]
         st.plotly_chart(fig, use_container_width=True)
 
-    st.subheader('Material Library & Substance Registry (Demo)')
-    st.dataframe(pd.DataFrame(material_library), use_container_width=True)
-
-    st.subheader('Digital Traceability Readiness')
-    st.dataframe(pd.DataFrame(traceability_readiness), use_container_width=True)
-
 def render_production():
     st.markdown('## Production Unit Communication')
 
     st.subheader('Controlled Engineering Change Orders (ECO)')
-    eco = pd.DataFrame([
+    eco = _df([
         {'ECO#': 'ECO-9001', 'SKU': 'FOOD-P-007', 'State': 'Approved', 'Age (days)': 5, 'Owner': 'R&D'},
         {'ECO#': 'ECO-9002', 'SKU': 'BATT-L-003', 'State': 'Review', 'Age (days)': 9, 'Owner': 'QA'},
         {'ECO#': 'ECO-9003', 'SKU': 'ELEC-E-019', 'State': 'Released', 'Age (days)': 2, 'Owner': 'Production'},
     ])
-    st.dataframe(eco, use_container_width=True)
+    st.table(eco)
 
     st.subheader('Manufacturing Instruction Update & Quality Checks')
-    mi = pd.DataFrame([
+    mi = _df([
         {'Instruction': 'New packaging assembly (PET label)', 'Site': 'Pune', 'Checklist': '10 steps', 'Completion': '80%'},
         {'Instruction': 'Battery recycled content QC', 'Site': 'Chennai', 'Checklist': '7 steps', 'Completion': '71%'},
     ])
-    st.dataframe(mi, use_container_width=True)
+    st.table(mi)
 
     st.subheader('BOM Update & Rollout')
-    bom = pd.DataFrame([
+    bom = _df([
         {'SKU': 'FOOD-P-007', 'Plant': 'Pune', 'BOM Compliance %': 92, 'Obsolete Material Usage (trend)': '↓'},
         {'SKU': 'BATT-L-003', 'Plant': 'Chennai', 'BOM Compliance %': 88, 'Obsolete Material Usage (trend)': '↓'},
     ])
-    st.dataframe(bom, use_container_width=True)
+    st.table(bom)
 
 def render_marketing():
     st.markdown('## Marketing & Sales Communication')
 
     st.subheader('Compliance Data Sheet Generation')
-    cds = pd.DataFrame([
+    cds = _df([
         {'SKU': 'FOOD-P-007', 'Sheet Version': 'v3.1', 'Coverage': 'Updated claims, end‑of‑life', 'Status': 'Ready'},
         {'SKU': 'ELEC-E-019', 'Sheet Version': 'v1.8', 'Coverage': 'UID, take‑back scheme', 'Status': 'Ready'},
     ])
-    st.dataframe(cds, use_container_width=True)
+    st.table(cds)
 
     st.subheader('Digital Asset Management (DAM) – Labels & Web Copy')
-    dam = pd.DataFrame([
+    dam = _df([
         {'Asset': 'Label artwork', 'SKU': 'FOOD-P-007', 'Version': 'v3', 'Approval': 'Approved'},
         {'Asset': 'Web product page', 'SKU': 'ELEC-E-019', 'Version': 'v12', 'Approval': 'Pending Legal'},
     ])
-    st.dataframe(dam, use_container_width=True)
+    st.table(dam)
 
     st.subheader('Sales Enablement – Talking Points & Data Cards')
-    sales = pd.DataFrame([
+    sales = _df([
         {'SKU': 'FOOD-P-007', 'Talking Points': 'PET label, ≥20% recycled content, compliant disposal',
          'Verification': 'CPCB filing ID: PWM‑2025‑13'},
         {'SKU': 'ELEC-E-019', 'Talking Points': 'UID traceability, take‑back partner network',
          'Verification': 'E‑Waste UID pilot: #EWR‑2025‑07'},
     ])
-    st.dataframe(sales, use_container_width=True)
+    st.table(sales)
 
 # -----------------------------
 # Sidebar & View Selection
 # -----------------------------
+# Dispatch table: the radio options are generated from it, so they cannot drift apart.
+RENDERERS = {
+    "Landing": render_landing,
+    "Mandatory Compliance": render_compliance,
+    "Alerts & Thresholds": render_alerts,
+    "Inventory Management": render_inventory,
+    "EPR Tracking": render_epr,
+    "Eco‑Design & Substance Registry": render_ecodesign,
+    "Production Communication": render_production,
+    "Marketing & Sales": render_marketing,
+}
+
 with st.sidebar:
     st.title('Waste Mgmt Tool')
     st.selectbox('Period', ['FY 2025', 'FY 2026'], key='period')
@@ -515,37 +619,22 @@ with st.sidebar:
     st.selectbox('Material', ['All Materials', 'Plastic', 'E‑Waste', 'Battery'], key='material')
     st.caption('Synthetic demo data')
     st.markdown('---')
-    view = st.radio(
-        "Choose dashboard",
-        [
-            "Landing",
-            "Mandatory Compliance",
-            "Alerts & Thresholds",
-            "Inventory Management",
-            "EPR Tracking",
-            "Eco‑Design & Substance Registry",
-            "Production Communication",
-            "Marketing & Sales",
-        ],
-        index=0
-    )
+    view = st.radio("Choose dashboard", list(RENDERERS), index=0)
 
 # -----------------------------
-# Render selected view (ALL branches have an indented block)
+# Render selected view (append ?profile=1 to the URL for a cProfile top-25 in the sidebar)
 # -----------------------------
-if view == "Landing":
-    render_landing()
-elif view == "Mandatory Compliance":
-    render_compliance()
-elif view == "Alerts & Thresholds":
-    render_alerts()
-elif view == "Inventory Management":
-    render_inventory()
-elif view == "EPR Tracking":
-    render_epr()
-elif view == "Eco‑Design & Substance Registry":
-    render_ecodesign()
-elif view == "Production Communication":
-    render_production()
-elif view == "Marketing & Sales":
-    render_marketing()
+if st.query_params.get("profile") == "1":
+    import cProfile
+    import io
+    import pstats
+
+    profiler = cProfile.Profile()
+    profiler.enable()
+    RENDERERS[view]()
+    profiler.disable()
+    stats_out = io.StringIO()
+    pstats.Stats(profiler, stream=stats_out).sort_stats("cumulative").print_stats(25)
+    st.sidebar.code(stats_out.getvalue())
+else:
+    RENDERERS[view]()